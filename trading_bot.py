@@ -12,10 +12,23 @@ Features:
 """
 
 import argparse
+import asyncio
+import atexit
+import functools
+import hashlib
+import hmac
 import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from decimal import ROUND_FLOOR, Decimal
 from pathlib import Path
 
 # --- Try to import colorlog for pretty colors ---
@@ -24,12 +37,20 @@ try:
 except ImportError:
     colorlog = None
 
-# --- Optional: Binance client if available ---
+# --- Optional: NumPy for multi-symbol price/size arrays ---
 try:
-    from binance.client import Client
-    from binance.enums import *
+    import numpy as np
 except ImportError:
-    Client = None
+    np = None
+
+# --- Optional: orjson for faster JSON encode/decode ---
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# --- Optional: Binance client, imported on first real-bot use (see _import_binance) ---
+Client = None
 
 # --- Constants ---
 SIDE_BUY = "BUY"
@@ -40,15 +61,50 @@ LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 LOG_FILE = LOG_DIR / "bot.log"
 
+# --- HTTP connection reuse (real bot) ---
+POOL_CONNECTIONS = 40  # distinct hosts kept warm
+POOL_MAXSIZE = 100  # concurrent keep-alive connections per host
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+PRICE_MAX_AGE = 2.0  # seconds before a streamed mark price is considered stale
+CACHE_TTL = 1.0  # seconds to reuse REST balance/price responses
+
+# --- Futures WebSocket API (order placement over a persistent socket) ---
+WS_API_URL = "wss://ws-fapi.binance.com/ws-fapi/v1"
+WS_API_TESTNET_URL = "wss://testnet.binancefuture.com/ws-fapi/v1"
+WS_API_TIMEOUT = 10.0  # seconds, same as python-binance's REST timeout
+_sessions = {}
+
+# Persistent worker pool for overlapping independent REST round trips
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bot-io")
+
+# Mock bots with balance changes not yet written; held strongly so a bot
+# that is dropped before exit still gets flushed
+_mock_bots = set()
+
+# Background thread that drains queued log records to the real handlers
+_log_listener = None
+
 
 # ==========================
 # Logging Configuration
 # ==========================
-def setup_logger():
+def setup_logger(verbose=False):
     """Set up colorized logger (console + file)."""
     logger = logging.getLogger()
+    global _log_listener
     logger.setLevel(logging.INFO)
 
+    # Stop a previous listener so its handlers flush before being replaced
+    if _log_listener:
+        _log_listener.stop()
+        for h in _log_listener.handlers:
+            # MemoryHandler.close() flushes to its target and drops it without closing it
+            target = getattr(h, "target", None)
+            h.close()
+            if target:
+                target.close()
+        atexit.unregister(_log_listener.stop)
+
     # Remove any previous handlers
     for h in logger.handlers[:]:
         logger.removeHandler(h)
@@ -57,9 +113,15 @@ def setup_logger():
     file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8")
     file_formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
     file_handler.setFormatter(file_formatter)
+    # Buffer file writes; flush every 1024 records, on ERROR, and at exit
+    buffered_file_handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=file_handler
+    )
+    buffered_file_handler.setLevel(logging.INFO)
 
     # Console handler (colorized if colorlog available)
     console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO if verbose else logging.WARNING)
     if colorlog:
         color_formatter = colorlog.ColoredFormatter(
             "%(log_color)s%(asctime)s [%(levelname)s]%(reset)s %(message_log_color)s%(message)s",
@@ -84,8 +146,19 @@ def setup_logger():
     else:
         console_handler.setFormatter(file_formatter)
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Logging calls only enqueue the record; console and file I/O happen on
+    # the listener thread.
+    log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, buffered_file_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    # QueueHandler.prepare() formats the message on the calling thread, so
+    # drop records no downstream handler wants before they get that far.
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(min(h.level for h in _log_listener.handlers))
+    logger.addHandler(queue_handler)
 
     return logger
 
@@ -93,95 +166,363 @@ def setup_logger():
 logger = setup_logger()
 
 
+# ==========================
+# Symbol Helpers
+# ==========================
+@functools.lru_cache(maxsize=4096)
+def _parse_symbol(symbol):
+    """Return (normalized symbol, base asset), e.g. "btcusdt" -> ("BTCUSDT", "BTC")."""
+    symbol = symbol.upper()
+    return symbol, symbol.replace("USDT", "")
+
+
+def _floor_to_step(value, step):
+    """Floor `value` to a multiple of an exchange step/tick size, as a plain decimal string."""
+    step = Decimal(step)
+    floored = (Decimal(str(value)) / step).to_integral_value(rounding=ROUND_FLOOR) * step
+    return format(floored.normalize(), "f")
+
+
+# ==========================
+# Timestamp Helper
+# ==========================
+_ts_prefix = (None, "")  # (epoch second, "YYYY-MM-DDTHH:MM:SS")
+
+
+def _utc_timestamp():
+    """Return the current UTC time as ISO-8601 with microseconds, e.g. 2025-01-01T12:00:00.123456Z."""
+    global _ts_prefix
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _ts_prefix
+    if sec != cached_sec:
+        # Only the sub-second part changes within a second; format the rest once.
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_prefix = (sec, prefix)
+    return f"{prefix}.{ns // 1000:06d}Z"
+
+
+# ==========================
+# JSON Helpers
+# ==========================
+if orjson:
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj, indent=True):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+
+else:
+
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj, indent=True):
+        return json.dumps(obj, indent=2) if indent else json.dumps(obj, separators=(",", ":"))
+
+
+def _orjson_response_hook(response, *args, **kwargs):
+    """Make python-binance's response.json() decode with orjson."""
+    response.json = lambda **_: orjson.loads(response.content)
+    return response
+
+
+# ==========================
+# Lazy Binance Import
+# ==========================
+def _import_binance():
+    """Import python-binance and its HTTP/websocket deps on first use.
+
+    python-binance pulls in requests, aiohttp, websockets and SSL setup at import
+    time, which the mock bot never needs.
+    """
+    global Client, ThreadedWebsocketManager, requests, HTTPAdapter, Retry, websockets
+    if Client is not None:
+        return
+    try:
+        from binance.client import Client
+        from binance.streams import ThreadedWebsocketManager
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        import websockets
+    except ImportError:
+        raise ImportError("Binance package not installed. Run: pip install python-binance") from None
+
+
+# ==========================
+# HTTP Session (keep-alive)
+# ==========================
+def _build_session(api_key, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """Create a keep-alive session with pooled connections and retries on transient errors."""
+    _import_binance()
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False,  # let python-binance turn the final response into an API error
+    )
+    # pool_block=False: open an extra (non-pooled) connection instead of
+    # waiting for a free keep-alive slot during bursts.
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=False,
+        max_retries=retries,
+    )
+    session.mount("https://", adapter)
+    session.headers.update(
+        {
+            "Accept": "application/json",
+            "X-MBX-APIKEY": api_key,
+            "Connection": "keep-alive",
+        }
+    )
+    if orjson:
+        session.hooks["response"].append(_orjson_response_hook)
+    return session
+
+
+def _get_session(api_key):
+    """Return the shared session for an API key, creating it on first use."""
+    session = _sessions.get(api_key)
+    if session is None:
+        session = _sessions[api_key] = _build_session(api_key)
+    return session
+
+
 # ==========================
 # Mock Bot Implementation
 # ==========================
 class MockFuturesBot:
     """Simulates Binance Futures trading for testing and portfolios."""
 
-    def __init__(self):
+    def __init__(self, flush_every=1):
         self.balance_file = DATA_DIR / "mock_balance.json"
         self.price_file = DATA_DIR / "mock_prices.json"
 
         if not self.balance_file.exists():
             with open(self.balance_file, "w") as f:
-                json.dump({"USDT": 1000.0, "BTC": 0.0, "ETH": 0.0}, f, indent=2)
+                f.write(_dumps({"USDT": 1000.0, "BTC": 0.0, "ETH": 0.0}))
 
         if not self.price_file.exists():
             with open(self.price_file, "w") as f:
-                json.dump(
-                    [
-                        {"symbol": "BTCUSDT", "price": 68000.0},
-                        {"symbol": "ETHUSDT", "price": 3200.0},
-                        {"symbol": "BNBUSDT", "price": 560.0},
-                    ],
-                    f,
-                    indent=2,
+                f.write(
+                    _dumps(
+                        [
+                            {"symbol": "BTCUSDT", "price": 68000.0},
+                            {"symbol": "ETHUSDT", "price": 3200.0},
+                            {"symbol": "BNBUSDT", "price": 560.0},
+                        ]
+                    )
                 )
 
+        # Read both files once; orders mutate the in-memory balance and
+        # write it back every `flush_every` successful orders (and on close/exit).
+        self._balance = self._load_balance()
+        self._lock = threading.Lock()
+        self.flush_every = flush_every
+        self._unsaved = 0
+        with open(self.price_file, "rb") as f:
+            self._prices = {p["symbol"]: p["price"] for p in _loads(f.read())}
+
         logger.info("Initialized Mock Futures Bot.")
 
     def _load_balance(self):
-        with open(self.balance_file) as f:
-            return json.load(f)
-
-    def _save_balance(self, bal):
-        with open(self.balance_file, "w") as f:
-            json.dump(bal, f, indent=2)
+        with open(self.balance_file, "rb") as f:
+            return _loads(f.read())
+
+    def _save_balance(self):
+        """Atomically replace the balance file (write a temp file, then rename)."""
+        data = _dumps(self._balance)
+        f = tempfile.NamedTemporaryFile(
+            "w", dir=self.balance_file.parent, suffix=".tmp", delete=False
+        )
+        try:
+            with f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            # NamedTemporaryFile creates the file 0600; keep the balance file's mode.
+            try:
+                mode = os.stat(self.balance_file).st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(f.name, mode)
+            os.replace(f.name, self.balance_file)
+        except OSError:
+            os.unlink(f.name)
+            raise
+        self._unsaved = 0
+        _mock_bots.discard(self)
+
+    def flush(self):
+        """Write pending balance changes to disk."""
+        with self._lock:
+            if self._unsaved:
+                self._save_balance()
 
     def get_all_prices(self):
-        with open(self.price_file) as f:
-            prices = json.load(f)
-        return prices
+        return [{"symbol": s, "price": p} for s, p in self._prices.items()]
 
     def get_price(self, symbol: str):
-        for p in self.get_all_prices():
-            if p["symbol"] == symbol.upper():
-                return p["price"]
-        raise ValueError(f"Symbol {symbol} not found")
-
-    def place_market_order(self, symbol: str, side: str, amount: float):
-        bal = self._load_balance()
+        try:
+            return self._prices[_parse_symbol(symbol)[0]]
+        except KeyError:
+            raise ValueError(f"Symbol {symbol} not found") from None
+
+    def get_prices(self, symbols):
+        """Return prices for several symbols as a float64 array, in the given order."""
+        if np is None:
+            raise ImportError("NumPy not installed. Run: pip install numpy")
+        try:
+            return np.array([self._prices[_parse_symbol(s)[0]] for s in symbols], dtype=np.float64)
+        except KeyError as e:
+            raise ValueError(f"Symbol {e.args[0]} not found") from None
+
+    def place_market_order(self, symbol: str, side: str, amount: float, timestamp=None):
+        """Fill a simulated market order; pass `timestamp` to use simulator time instead of the clock."""
+        bal = self._balance
+        symbol, base = _parse_symbol(symbol)
         price = self.get_price(symbol)
-        base = symbol.replace("USDT", "")
-
-        if side == SIDE_BUY:
-            cost = price * amount
-            if bal["USDT"] >= cost:
-                bal["USDT"] -= cost
-                bal[base] = bal.get(base, 0) + amount
-                msg = f"Bought {amount} {base} for {cost:.2f} USDT"
-                logger.info(msg)
-            else:
-                logger.error("Not enough USDT balance.")
-                raise ValueError("Not enough USDT balance.")
-
-        elif side == SIDE_SELL:
-            if bal.get(base, 0) >= amount:
-                bal["USDT"] += price * amount
-                bal[base] -= amount
-                msg = f"Sold {amount} {base} for {price * amount:.2f} USDT"
-                logger.info(msg)
+
+        # Every order touches USDT, so one lock over the in-memory balance is
+        # as fine-grained as it can usefully get.
+        with self._lock:
+            if side == SIDE_BUY:
+                cost = price * amount
+                if bal["USDT"] >= cost:
+                    bal["USDT"] -= cost
+                    bal[base] = bal.get(base, 0) + amount
+                    logger.info("Bought %s %s for %.2f USDT", amount, base, cost)
+                else:
+                    logger.error("Not enough USDT balance.")
+                    raise ValueError("Not enough USDT balance.")
+
+            elif side == SIDE_SELL:
+                if bal.get(base, 0) >= amount:
+                    bal["USDT"] += price * amount
+                    bal[base] -= amount
+                    logger.info("Sold %s %s for %.2f USDT", amount, base, price * amount)
+                else:
+                    logger.error("Not enough %s balance.", base)
+                    raise ValueError(f"Not enough {base} balance.")
             else:
-                logger.error(f"Not enough {base} balance.")
-                raise ValueError(f"Not enough {base} balance.")
-        else:
-            logger.error("Invalid order side.")
-            raise ValueError("Invalid side. Use BUY or SELL.")
+                logger.error("Invalid order side.")
+                raise ValueError("Invalid side. Use BUY or SELL.")
 
-        self._save_balance(bal)
+            self._unsaved += 1
+            _mock_bots.add(self)
+            if self._unsaved >= self.flush_every:
+                self._save_balance()
         return {
             "symbol": symbol,
             "side": side,
             "amount": amount,
             "price": price,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp if timestamp is not None else _utc_timestamp(),
         }
 
+    def get_balance(self, asset="USDT"):
+        with self._lock:
+            return self._balance.get(asset, 0.0)
+
     def show_balance(self):
-        bal = self._load_balance()
         logger.info("Balance checked.")
-        return bal
+        with self._lock:
+            return dict(self._balance)
+
+    def close(self):
+        """Persist any unsaved balance changes."""
+        self.flush()
+
+
+@atexit.register
+def _flush_mock_bots():
+    for bot in list(_mock_bots):
+        bot.flush()
+
+
+# ==========================
+# WebSocket API Connection
+# ==========================
+class _WsApiConnection:
+    """Persistent Binance Futures WebSocket API connection (request/response by id).
+
+    websockets (as pinned by python-binance) is asyncio-only, so the socket
+    lives on a private event loop thread and callers block on the result. A
+    single reader task owns recv() and resolves one future per request id.
+    """
+
+    def __init__(self, url, timeout=WS_API_TIMEOUT):
+        self.timeout = timeout
+        self._pending = {}  # request id -> asyncio.Future, touched only on the loop thread
+        self._dead = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="ws-api", daemon=True)
+        self._thread.start()
+        try:
+            self._ws = self._run(self._connect(url))
+        except Exception:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            raise
+        asyncio.run_coroutine_threadsafe(self._read_loop(), self._loop)
+
+    @staticmethod
+    async def _connect(url):
+        return await websockets.connect(url)
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(self.timeout)
+
+    async def _read_loop(self):
+        try:
+            async for raw in self._ws:
+                msg = _loads(raw)
+                fut = self._pending.pop(msg.get("id"), None)
+                if fut and not fut.done():
+                    fut.set_result(msg)
+        except Exception as e:
+            logger.warning("WebSocket API connection lost: %s", e)
+        finally:
+            self._dead = True
+            for fut in self._pending.values():
+                if not fut.done():
+                    fut.set_exception(ConnectionError("WebSocket API connection closed"))
+            self._pending.clear()
+
+    async def _request(self, payload):
+        fut = self._loop.create_future()
+        self._pending[payload["id"]] = fut
+        try:
+            await self._ws.send(_dumps(payload, indent=False))
+            return await fut
+        finally:
+            self._pending.pop(payload["id"], None)
+
+    @property
+    def open(self):
+        return not self._dead and self._ws.open
+
+    def request(self, method, params):
+        payload = {"id": uuid.uuid4().hex, "method": method, "params": params}
+        future = asyncio.run_coroutine_threadsafe(self._request(payload), self._loop)
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            # The request may have reached Binance; stop using this socket so
+            # later orders go over REST instead of racing an unknown state.
+            self._dead = True
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+            raise TimeoutError(f"{method} timed out after {self.timeout}s; its outcome is unknown") from None
+
+    def close(self):
+        try:
+            self._run(self._ws.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
 
 
 # ==========================
@@ -190,37 +531,229 @@ class MockFuturesBot:
 class RealFuturesBot:
     """Connects to Binance Testnet or Live."""
 
-    def __init__(self, api_key, api_secret, testnet=True):
-        if not Client:
-            raise ImportError("Binance package not installed. Run: pip install python-binance")
+    def __init__(
+        self,
+        api_key,
+        api_secret,
+        testnet=True,
+        session=None,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        stream_symbols=None,
+        price_max_age=PRICE_MAX_AGE,
+        cache_ttl=CACHE_TTL,
+        ws_orders=False,
+    ):
+        _import_binance()
         self.client = Client(api_key, api_secret, testnet=testnet)
+
+        # Swap python-binance's default session for a pooled keep-alive one,
+        # so every REST call reuses the same TLS connection.
+        self.client.session.close()
+        self.session = session or _build_session(api_key, pool_connections, pool_maxsize)
+        self.client.session = self.session
+
+        # Precompute the HMAC key state once; each signature copies it instead
+        # of re-deriving the inner/outer pads from the secret.
+        self._hmac = hmac.new(api_secret.encode(), digestmod=hashlib.sha256)
+        self.client._generate_signature = self._sign_rest
         logger.info(f"Connected to Binance {'Testnet' if testnet else 'Live'}")
 
+        # Short-lived response caches: (value, monotonic timestamp)
+        self.cache_ttl = cache_ttl
+        self._balance_cache = None
+        self._price_cache = {}
+        self._symbol_filters = None  # exchange filters per symbol, fetched once
+
+        # Optional mark-price stream: get_price() then reads from memory and
+        # only falls back to REST when the cached price is stale.
+        self.price_max_age = price_max_age
+        self._twm = None
+        if stream_symbols:
+            self._twm = ThreadedWebsocketManager(api_key, api_secret, testnet=testnet)
+            self._twm.start()
+            for symbol in stream_symbols:
+                self._twm.start_symbol_mark_price_socket(self._on_mark_price, _parse_symbol(symbol)[0])
+            logger.info(f"Streaming mark prices for {', '.join(stream_symbols)}")
+
+        # Optional WebSocket API session for order placement; REST is used
+        # whenever the socket is unavailable.
+        self._api_key = api_key
+        self._ws_api = None
+        if ws_orders:
+            try:
+                self._ws_api = _WsApiConnection(WS_API_TESTNET_URL if testnet else WS_API_URL)
+                logger.info("Connected to Binance Futures WebSocket API for orders.")
+            except Exception as e:
+                logger.warning(f"WebSocket API unavailable, placing orders over REST: {e}")
+
+    def _on_mark_price(self, msg):
+        # Futures sockets are combined streams: {"stream": ..., "data": {...}}
+        data = msg.get("data", msg)
+        event = data.get("e")
+        if event == "markPriceUpdate":
+            self._price_cache[data["s"]] = (float(data["p"]), time.monotonic())
+        elif event == "error":
+            logger.warning("Mark price stream error: %s", data.get("m", data))
+
     def get_all_prices(self):
         prices = self.client.futures_symbol_ticker()
         return [{"symbol": p["symbol"], "price": float(p["price"])} for p in prices]
 
     def get_price(self, symbol):
-        ticker = self.client.futures_symbol_ticker(symbol=symbol)
-        return float(ticker["price"])
+        symbol = _parse_symbol(symbol)[0]
+        max_age = self.price_max_age if self._twm else self.cache_ttl
+        cached = self._price_cache.get(symbol)
+        if cached and time.monotonic() - cached[1] <= max_age:
+            return cached[0]
+
+        if self._twm:
+            price = float(self.client.futures_mark_price(symbol=symbol)["markPrice"])
+        else:
+            price = float(self.client.futures_symbol_ticker(symbol=symbol)["price"])
+        self._price_cache[symbol] = (price, time.monotonic())
+        return price
+
+    def get_prices(self, symbols):
+        """Return prices for several symbols as a float64 array, from one ticker request."""
+        if np is None:
+            raise ImportError("NumPy not installed. Run: pip install numpy")
+        prices = {p["symbol"]: p["price"] for p in self.get_all_prices()}
+        try:
+            return np.array([prices[_parse_symbol(s)[0]] for s in symbols], dtype=np.float64)
+        except KeyError as e:
+            raise ValueError(f"Symbol {e.args[0]} not found") from None
+
+    def _sign(self, query_string):
+        h = self._hmac.copy()
+        h.update(query_string.encode())
+        return h.hexdigest()
+
+    def _sign_rest(self, data):
+        """Drop-in for python-binance's Client._generate_signature."""
+        return self._sign("&".join(f"{k}={v}" for k, v in self.client._order_params(data)))
+
+    def _place_order_ws(self, **params):
+        params.update(apiKey=self._api_key, timestamp=int(time.time() * 1000))
+        # Send values exactly as they were signed
+        params = {k: str(v) for k, v in params.items()}
+        params["signature"] = self._sign("&".join(f"{k}={params[k]}" for k in sorted(params)))
+        response = self._ws_api.request("order.place", params)
+        if response.get("status") != 200:
+            error = response.get("error", {})
+            raise ValueError(f"Order rejected ({error.get('code')}): {error.get('msg')}")
+        return response["result"]
 
     def place_market_order(self, symbol, side, amount):
-        order = self.client.futures_create_order(symbol=symbol, side=side, type="MARKET", quantity=amount)
-        logger.info(f"Executed {side} order for {symbol}, qty={amount}")
+        if self._ws_api and self._ws_api.open:
+            order = self._place_order_ws(symbol=symbol, side=side, type="MARKET", quantity=amount)
+        else:
+            order = self.client.futures_create_order(symbol=symbol, side=side, type="MARKET", quantity=amount)
+        self._balance_cache = None
+        logger.info("Executed %s order for %s, qty=%s", side, symbol, amount)
         return order
 
-    def show_balance(self):
-        balances = self.client.futures_account_balance()
+    def set_leverage(self, symbol, leverage):
+        result = self.client.futures_change_leverage(symbol=symbol, leverage=leverage)
+        logger.info("Set %s leverage to %sx", symbol, leverage)
+        return result
+
+    def get_symbol_filters(self, symbol):
+        """Return the exchange filters for a symbol keyed by filterType (exchange info is cached)."""
+        if self._symbol_filters is None:
+            info = self.client.futures_exchange_info()
+            self._symbol_filters = {
+                s["symbol"]: {f["filterType"]: f for f in s["filters"]} for s in info["symbols"]
+            }
+        try:
+            return self._symbol_filters[_parse_symbol(symbol)[0]]
+        except KeyError:
+            raise ValueError(f"Symbol {symbol} not found") from None
+
+    def round_quantity(self, symbol, quantity):
+        """Floor a market order quantity to the symbol's lot step size."""
+        filters = self.get_symbol_filters(symbol)
+        lot = filters.get("MARKET_LOT_SIZE") or filters["LOT_SIZE"]
+        return _floor_to_step(quantity, lot["stepSize"])
+
+    def round_price(self, symbol, price):
+        """Floor a price to the symbol's tick size."""
+        return _floor_to_step(price, self.get_symbol_filters(symbol)["PRICE_FILTER"]["tickSize"])
+
+    def set_risk_management(self, symbol, side, entry_price, stop_loss_pct, take_profit_pct):
+        """Place stop-loss and take-profit orders for a position in one batch request."""
+        exit_side = SIDE_SELL if side == SIDE_BUY else SIDE_BUY
+        direction = 1 if side == SIDE_BUY else -1
+        stop_price = entry_price * (1 - direction * stop_loss_pct)
+        take_price = entry_price * (1 + direction * take_profit_pct)
+
+        orders = [
+            {
+                "symbol": symbol,
+                "side": exit_side,
+                "type": "STOP_MARKET",
+                "stopPrice": self.round_price(symbol, stop_price),
+                "closePosition": "true",
+            },
+            {
+                "symbol": symbol,
+                "side": exit_side,
+                "type": "TAKE_PROFIT_MARKET",
+                "stopPrice": self.round_price(symbol, take_price),
+                "closePosition": "true",
+            },
+        ]
+        # python-binance URL-encodes the batchOrders JSON before signing.
+        result = self.client.futures_place_batch_order(batchOrders=_dumps(orders, indent=False))
+        rejected = [order for order in result if "code" in order]
+        if rejected:
+            # Never leave half a bracket live: cancel whichever leg was accepted.
+            for order in result:
+                if "orderId" in order:
+                    try:
+                        self.client.futures_cancel_order(symbol=symbol, orderId=order["orderId"])
+                    except Exception as e:
+                        logger.error("Could not cancel %s risk order %s: %s", symbol, order["orderId"], e)
+            reasons = "; ".join(f"{o.get('code')}: {o.get('msg')}" for o in rejected)
+            logger.error("Risk orders rejected for %s: %s", symbol, reasons)
+            raise ValueError(f"SL/TP placement failed for {symbol}, position is unprotected ({reasons})")
+        logger.info("Placed SL @ %.2f and TP @ %.2f for %s", stop_price, take_price, symbol)
+        return {"stop_loss": result[0], "take_profit": result[1]}
+
+    def get_balances(self):
+        """Return the futures account balance entries keyed by asset."""
+        cached = self._balance_cache
+        if cached and time.monotonic() - cached[1] < self.cache_ttl:
+            return cached[0]
+
+        account = self.client.futures_account_balance()
+        balances = {item["asset"]: item for item in account}
+        self._balance_cache = (balances, time.monotonic())
         logger.info("Fetched live futures account balance.")
         return balances
 
+    def get_balance(self, asset="USDT"):
+        item = self.get_balances().get(asset)
+        return float(item["balance"]) if item else 0.0
+
+    def show_balance(self):
+        return {asset: float(item["balance"]) for asset, item in self.get_balances().items()}
+
+    def close(self):
+        """Stop the price stream and WebSocket API (if any) and close pooled HTTP connections."""
+        if self._twm:
+            self._twm.stop()
+        if self._ws_api:
+            self._ws_api.close()
+        self.session.close()
+
 
 # ==========================
 # Utility: Build Bot
 # ==========================
 def build_bot(api_key=None, api_secret=None, use_real=False):
     if use_real and api_key and api_secret:
-        return RealFuturesBot(api_key, api_secret, testnet=True)
+        return RealFuturesBot(api_key, api_secret, testnet=True, session=_get_session(api_key))
     else:
         return MockFuturesBot()
 
@@ -230,59 +763,176 @@ def build_bot(api_key=None, api_secret=None, use_real=False):
 # ==========================
 def calculate_position_size(bot, symbol: str, risk_pct: float, stop_loss_pct: float, leverage: int = 1):
     """Calculate position size given risk %, stop loss, and leverage."""
-    balance = bot.show_balance()
-    usdt_balance = balance.get("USDT", 0)
-    price = bot.get_price(symbol)
+    # Balance and price are independent requests, so fetch them concurrently.
+    fut_balance = _executor.submit(bot.get_balance)
+    fut_price = _executor.submit(bot.get_price, symbol)
+    usdt_balance = fut_balance.result()
+    price = fut_price.result()
     risk_amount = usdt_balance * (risk_pct / 100)
     position_size = (risk_amount * leverage) / (price * stop_loss_pct)
-    logger.info(f"Calculated position size: {position_size:.6f} {symbol} @ {price:.2f} USDT")
+    logger.info("Calculated position size: %.6f %s @ %.2f USDT", position_size, symbol, price)
     return position_size, price
 
 
+def calculate_position_sizes(balances, prices, risk_pct: float, stop_loss_pct: float, leverage: int = 1):
+    """Vectorized position sizing over arrays of balances and prices (scalars broadcast)."""
+    if np is None:
+        raise ImportError("NumPy not installed. Run: pip install numpy")
+    balances = np.asarray(balances, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+    return (balances * (risk_pct / 100.0) * leverage) / (prices * stop_loss_pct)
+
+
+# ==========================
+# Utility: Open Position (real bot)
+# ==========================
+def open_position(
+    bot, symbol: str, side: str, risk_pct: float, stop_loss_pct: float, take_profit_pct: float, leverage: int = 1
+):
+    """Set leverage, size and enter a market position, then attach SL/TP orders."""
+    # Leverage and exchange filters have no data dependency on sizing, so
+    # overlap those round trips.
+    fut_leverage = _executor.submit(bot.set_leverage, symbol, leverage)
+    fut_filters = _executor.submit(bot.get_symbol_filters, symbol)
+    qty, price = calculate_position_size(bot, symbol, risk_pct, stop_loss_pct, leverage)
+    fut_leverage.result()
+    fut_filters.result()
+
+    quantity = bot.round_quantity(symbol, qty)
+    if Decimal(quantity) <= 0:
+        raise ValueError(f"Position size {qty:.8f} {symbol} is below the minimum lot step.")
+
+    order = bot.place_market_order(symbol, side, quantity)
+    entry_price = float(order.get("avgPrice") or 0) or price
+    risk_orders = bot.set_risk_management(symbol, side, entry_price, stop_loss_pct, take_profit_pct)
+    return {"entry": order, **risk_orders}
+
+
+# ==========================
+# CLI Commands
+# ==========================
+def cmd_prices(bot, args):
+    print(_dumps(bot.get_all_prices()))
+
+
+def cmd_balance(bot, args):
+    print(_dumps(bot.show_balance()))
+
+
+def cmd_buy(bot, args):
+    order = bot.place_market_order(args.symbol, SIDE_BUY, args.amount)
+    print(_dumps(order))
+
+
+def cmd_sell(bot, args):
+    order = bot.place_market_order(args.symbol, SIDE_SELL, args.amount)
+    print(_dumps(order))
+
+
+def cmd_calc(bot, args):
+    qty, price = calculate_position_size(bot, args.symbol, args.risk, args.stop, args.leverage)
+    print(f"Position size: {qty:.6f} units at {price:.2f} USDT")
+
+
+def cmd_calc_batch(bot, args):
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    fut_balance = _executor.submit(bot.get_balance)
+    fut_prices = _executor.submit(bot.get_prices, symbols)
+    usdt_balance = fut_balance.result()
+    prices = fut_prices.result()
+    sizes = calculate_position_sizes(usdt_balance, prices, args.risk, args.stop, args.leverage)
+    for symbol, qty, price in zip(symbols, sizes, prices):
+        print(f"{symbol}: {qty:.6f} units at {price:.2f} USDT")
+
+
+def cmd_open(bot, args):
+    if not isinstance(bot, RealFuturesBot):
+        logger.warning("The open command needs --use-real with API keys.")
+        return
+    result = open_position(bot, args.symbol, args.side, args.risk, args.stop, args.take_profit, args.leverage)
+    print(_dumps(result))
+
+
 # ==========================
 # CLI Interface
 # ==========================
+def _positive_float(value):
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
+def _positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
 def main():
-    parser = argparse.ArgumentParser(description="Mock Binance Portfolio Trading Bot CLI")
-    parser.add_argument("command", choices=["prices", "balance", "buy", "sell", "calc"], help="Command to run")
-    parser.add_argument("--symbol", help="Symbol (e.g., BTCUSDT)")
-    parser.add_argument("--amount", type=float, help="Amount to trade")
-    parser.add_argument("--risk", type=float, help="Risk percent for position sizing")
-    parser.add_argument("--stop", type=float, help="Stop loss percent (e.g. 0.01 = 1%)")
-    parser.add_argument("--leverage", type=int, default=1, help="Leverage")
-    parser.add_argument("--api-key", help="Binance API Key")
-    parser.add_argument("--api-secret", help="Binance API Secret")
-    parser.add_argument("--use-real", action="store_true", help="Use Binance Testnet instead of mock")
-
-    args = parser.parse_args()
-    bot = build_bot(args.api_key, args.api_secret, args.use_real)
+    # Connection/logging options are accepted before or after the command.
+    # SUPPRESS keeps a subcommand from overwriting a value given before it;
+    # the real defaults are pre-seeded on the namespace.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--api-key", default=argparse.SUPPRESS, help="Binance API Key")
+    common.add_argument("--api-secret", default=argparse.SUPPRESS, help="Binance API Secret")
+    common.add_argument(
+        "--use-real", action="store_true", default=argparse.SUPPRESS, help="Use Binance Testnet instead of mock"
+    )
+    common.add_argument(
+        "--verbose", action="store_true", default=argparse.SUPPRESS, help="Show INFO logs on the console"
+    )
+
+    parser = argparse.ArgumentParser(description="Mock Binance Portfolio Trading Bot CLI", parents=[common])
+    sub = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    p = sub.add_parser("prices", parents=[common], help="Show all prices")
+    p.set_defaults(func=cmd_prices)
+
+    p = sub.add_parser("balance", parents=[common], help="Show account balance")
+    p.set_defaults(func=cmd_balance)
+
+    for name, func in (("buy", cmd_buy), ("sell", cmd_sell)):
+        p = sub.add_parser(name, parents=[common], help=f"Place a market {name} order")
+        p.add_argument("--symbol", required=True, help="Symbol (e.g., BTCUSDT)")
+        p.add_argument("--amount", type=_positive_float, required=True, help="Amount to trade")
+        p.set_defaults(func=func)
+
+    p = sub.add_parser("calc", parents=[common], help="Calculate a position size")
+    p.add_argument("--symbol", required=True, help="Symbol (e.g., BTCUSDT)")
+    p.add_argument("--risk", type=_positive_float, required=True, help="Risk percent for position sizing")
+    p.add_argument("--stop", type=_positive_float, required=True, help="Stop loss percent (e.g. 0.01 = 1%%)")
+    p.add_argument("--leverage", type=_positive_int, default=1, help="Leverage")
+    p.set_defaults(func=cmd_calc)
+
+    p = sub.add_parser("calc-batch", parents=[common], help="Calculate position sizes for several symbols")
+    p.add_argument("--symbols", required=True, help="Comma-separated symbols (e.g., BTCUSDT,ETHUSDT)")
+    p.add_argument("--risk", type=_positive_float, required=True, help="Risk percent for position sizing")
+    p.add_argument("--stop", type=_positive_float, required=True, help="Stop loss percent (e.g. 0.01 = 1%%)")
+    p.add_argument("--leverage", type=_positive_int, default=1, help="Leverage")
+    p.set_defaults(func=cmd_calc_batch)
+
+    p = sub.add_parser("open", parents=[common], help="Open a position with SL/TP (real mode only)")
+    p.add_argument("--symbol", required=True, help="Symbol (e.g., BTCUSDT)")
+    p.add_argument("--side", choices=[SIDE_BUY, SIDE_SELL], required=True, help="Position side")
+    p.add_argument("--risk", type=_positive_float, required=True, help="Risk percent for position sizing")
+    p.add_argument("--stop", type=_positive_float, required=True, help="Stop loss percent (e.g. 0.01 = 1%%)")
+    p.add_argument("--take-profit", type=_positive_float, required=True, help="Take profit percent (e.g. 0.02 = 2%%)")
+    p.add_argument("--leverage", type=_positive_int, default=1, help="Leverage")
+    p.set_defaults(func=cmd_open)
+
+    args = parser.parse_args(
+        namespace=argparse.Namespace(api_key=None, api_secret=None, use_real=False, verbose=False)
+    )
+    if args.verbose:
+        setup_logger(verbose=True)
 
-    if args.command == "prices":
-        print(json.dumps(bot.get_all_prices(), indent=2))
-
-    elif args.command == "balance":
-        print(json.dumps(bot.show_balance(), indent=2))
-
-    elif args.command == "buy":
-        if not args.symbol or not args.amount:
-            logger.warning("Please provide --symbol and --amount")
-            return
-        order = bot.place_market_order(args.symbol, SIDE_BUY, args.amount)
-        print(json.dumps(order, indent=2))
-
-    elif args.command == "sell":
-        if not args.symbol or not args.amount:
-            logger.warning("Please provide --symbol and --amount")
-            return
-        order = bot.place_market_order(args.symbol, SIDE_SELL, args.amount)
-        print(json.dumps(order, indent=2))
-
-    elif args.command == "calc":
-        if not args.symbol or not args.risk or not args.stop:
-            logger.warning("Usage: python trading_bot.py calc --symbol BTCUSDT --risk 1 --stop 0.01 --leverage 5")
-            return
-        qty, price = calculate_position_size(bot, args.symbol, args.risk, args.stop, args.leverage)
-        print(f"Position size: {qty:.6f} units at {price:.2f} USDT")
+    bot = build_bot(args.api_key, args.api_secret, args.use_real)
+    try:
+        args.func(bot, args)
+    finally:
+        bot.close()
 
 
 if __name__ == "__main__":